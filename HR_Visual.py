@@ -1,6 +1,12 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from pathlib import Path
 
 # -----------------------------
 # Page Configuration
@@ -15,58 +21,236 @@ st.title("📊 Workforce Distribution Across Industries & Geographies")
 # -----------------------------
 # Load Data
 # -----------------------------
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        r"D:\Sailaja\Guvi\AIML\Mini Project 6 - Resource Management\Industry_cluster.csv"
-    )
+# Industry_cluster.parquet is generated once from the CSV by prepare_data.py
+DATA_PATH = Path(__file__).resolve().parent / "Industry_cluster.parquet"
 
-data = load_data()
-
-# -----------------------------
-# Normalize column names
-# -----------------------------
-data.columns = data.columns.str.strip().str.replace(" ", "_")
+id_cols = ["State", "District", "Industry_Category"]
 
 # -----------------------------
 # Identify Worker Columns
 # -----------------------------
-worker_cols = [c for c in data.columns if c.startswith(("Main_Workers", "Marginal_Workers"))]
-id_cols = [c for c in data.columns if c not in worker_cols]
+schema_names = pq.read_schema(DATA_PATH).names
 
-# -----------------------------
-# Wide → Long
-# -----------------------------
-long_data = data.melt(
-    id_vars=id_cols,
-    value_vars=worker_cols,
-    var_name="Variable",
-    value_name="Count"
-)
+worker_cols = [
+    c for c in schema_names
+    if c.startswith(("Main_Workers", "Marginal_Workers"))
+]
+
+# Remaining identifier columns (NIC class, codes, ...) are only needed for
+# the download, so they are loaded separately from the dashboard frame
+export_cols = [c for c in schema_names if c not in worker_cols and c not in id_cols]
+
+# Cached frames are keyed on the file's mtime so re-running prepare_data.py
+# invalidates them (including the on-disk cache)
+source_mtime = DATA_PATH.stat().st_mtime
+
+@st.cache_data(persist="disk")
+def load_data(source_mtime):
+    data = pd.read_parquet(
+        DATA_PATH,
+        columns=id_cols + worker_cols,
+        engine="pyarrow",
+        dtype_backend="pyarrow"
+    )
+
+    # Low-cardinality strings → category (int codes for isin / groupby)
+    for c in id_cols:
+        data[c] = data[c].astype("category")
+
+    # Worker counts are non-negative and well below 2**32 → uint32 halves
+    # the bytes scanned by every sum / groupby / pivot
+    data[worker_cols] = data[worker_cols].astype("uint32[pyarrow]")
+
+    return data
+
+data = load_data(source_mtime)
+
+@st.cache_data
+def load_export_columns(source_mtime):
+    # Same row order as load_data(), so the frames align on the index
+    return pd.read_parquet(
+        DATA_PATH,
+        columns=export_cols,
+        engine="pyarrow",
+        dtype_backend="pyarrow"
+    )
 
 # -----------------------------
-# Split Worker Metadata
+# Worker Metadata (one entry per worker column)
 # -----------------------------
-split_cols = long_data["Variable"].str.split("-", expand=True)
-
-long_data["Worker_Type"] = split_cols[0].replace({
+worker_type_names = {
     "Main_Workers": "Main",
     "Marginal_Workers": "Marginal"
-})
-long_data["Area"] = split_cols[1]
-long_data["Gender"] = split_cols[2].replace({
+}
+gender_names = {
     "Males": "Male",
     "Females": "Female",
     "Persons": "Total"
-})
+}
 
-long_data.drop(columns="Variable", inplace=True)
+worker_meta = [c.split("-") for c in worker_cols]
+col_worker_type = np.array([worker_type_names[m[0]] for m in worker_meta])
+col_area = np.array([m[1] for m in worker_meta])
+col_gender = np.array([gender_names[m[2]] for m in worker_meta])
+
+# (Worker_Type, Area, Gender) → wide worker column, and back
+worker_col_lookup = dict(zip(zip(col_worker_type, col_area, col_gender), worker_cols))
+worker_col_meta = {col: meta for meta, col in worker_col_lookup.items()}
+
+# Sidebar options come from the column metadata, never from the rows
+worker_type_options = sorted(set(col_worker_type))
+area_options = sorted(set(col_area))
+gender_options = sorted(set(col_gender))
 
 # -----------------------------
-# Convert Count to numeric
+# Wide → Long (cached in memory and on disk)
 # -----------------------------
-long_data["Count"] = pd.to_numeric(long_data["Count"], errors="coerce")
-long_data = long_data.dropna(subset=["Count"])
+# Bump LONG_VERSION whenever the derivation below changes so an older
+# persisted long form is not reused
+LONG_VERSION = 2
+LONG_PATH = DATA_PATH.with_name(f"long.v{LONG_VERSION}.parquet")
+
+@st.cache_data
+def build_long(source_mtime):
+    # Reuse the persisted long form if it is newer than the source file
+    if LONG_PATH.exists() and LONG_PATH.stat().st_mtime >= source_mtime:
+        return pd.read_parquet(LONG_PATH, engine="pyarrow")
+
+    data = load_data(source_mtime)
+
+    long_data = data.melt(
+        id_vars=id_cols,
+        value_vars=worker_cols,
+        var_name="Variable",
+        value_name="Count"
+    )
+
+    # melt stacks worker columns one after another, so the metadata of
+    # every row is just the per-column metadata repeated len(data) times
+    long_data["Worker_Type"] = np.repeat(col_worker_type, len(data))
+    long_data["Area"] = np.repeat(col_area, len(data))
+    long_data["Gender"] = np.repeat(col_gender, len(data))
+
+    for c in ["Worker_Type", "Area", "Gender"]:
+        long_data[c] = long_data[c].astype("category")
+
+    # Count keeps the uint32 dtype load_data() gives the worker columns
+    long_data.drop(columns="Variable", inplace=True)
+
+    # Persisting is only an optimization; a read-only app directory just
+    # means the long form is rebuilt after a restart. Write to a temp file
+    # and rename so a failed write never leaves a truncated LONG_PATH.
+    tmp_path = LONG_PATH.with_suffix(".tmp")
+    try:
+        long_data.to_parquet(tmp_path, engine="pyarrow", index=False)
+        tmp_path.replace(LONG_PATH)
+    except OSError:
+        pass
+
+    return long_data
+
+@st.cache_data
+def state_district_membership(source_mtime):
+    # States × Districts boolean matrix, indexed by category codes
+    data = load_data(source_mtime)
+    state_codes = data["State"].cat.codes.to_numpy()
+    district_codes = data["District"].cat.codes.to_numpy()
+    valid = (state_codes >= 0) & (district_codes >= 0)
+
+    membership = np.zeros(
+        (len(data["State"].cat.categories), len(data["District"].cat.categories)),
+        dtype=bool
+    )
+    membership[state_codes[valid], district_codes[valid]] = True
+    return membership
+
+@st.cache_data(max_entries=32)
+def workforce_summary(filter_key, geo_col, _filtered_data):
+    # Keyed on the filter tuple only; _filtered_data is not hashed
+    kpis = {
+        "total": _filtered_data["Count"].sum(),
+        "industries": _filtered_data["Industry_Category"].nunique(),
+        "states": _filtered_data["State"].nunique(),
+        "districts": _filtered_data["District"].nunique()
+    }
+
+    industry_df = (
+        _filtered_data.groupby("Industry_Category", observed=True)["Count"]
+        .sum()
+        .reset_index()
+        .sort_values("Count", ascending=False)
+    )
+
+    geo_df = (
+        _filtered_data.groupby(geo_col, observed=True)["Count"]
+        .sum()
+        .reset_index()
+        .sort_values("Count", ascending=False)
+    )
+
+    pivot_df = _filtered_data.pivot_table(
+        values="Count",
+        index="Industry_Category",
+        columns=geo_col,
+        aggfunc="sum",
+        fill_value=0,
+        observed=True
+    )
+
+    return kpis, industry_df, geo_df, pivot_df
+
+@st.cache_data(max_entries=32)
+def gender_composition(states, worker_type, source_mtime):
+    long_data = build_long(source_mtime)
+    return (
+        long_data[
+            (long_data["State"].isin(states)) &
+            (long_data["Worker_Type"] == worker_type)
+        ]
+        .groupby(["Industry_Category", "Gender"], observed=True)["Count"]
+        .sum()
+        .reset_index()
+    )
+
+def district_industry_sums(filtered_data):
+    # District × Industry Count sums in one bincount over the category codes
+    district_cats = filtered_data["District"].cat.categories
+    industry_cats = filtered_data["Industry_Category"].cat.categories
+    d = filtered_data["District"].cat.codes.to_numpy()
+    i = filtered_data["Industry_Category"].cat.codes.to_numpy()
+    c = filtered_data["Count"].to_numpy(dtype="float64")
+
+    valid = (d >= 0) & (i >= 0)
+    d, i, c = d[valid], i[valid], c[valid]
+
+    n_i = len(industry_cats)
+    sums = np.bincount(
+        d * n_i + i, weights=c, minlength=len(district_cats) * n_i
+    ).reshape(len(district_cats), n_i).astype(np.int64)
+
+    # Districts with at least one row, matching groupby(observed=True)
+    present = np.bincount(d, minlength=len(district_cats)) > 0
+    return sums[present], district_cats[present], industry_cats
+
+@st.cache_data(max_entries=8)
+def filtered_csv(filter_key, _filtered_data):
+    # Label which worker slice Count holds, as the long-form export did
+    worker_type, area, gender = worker_col_meta[filter_key[2]]
+    export = _filtered_data.join(load_export_columns(source_mtime)).assign(
+        Worker_Type=worker_type, Area=area, Gender=gender
+    )
+
+    # Baseline layout: identifier columns in source order, then the slice
+    export = export[
+        [c for c in schema_names if c not in worker_cols]
+        + ["Count", "Worker_Type", "Area", "Gender"]
+    ]
+
+    # Arrow's C++ CSV writer; serialized once per filter selection. Unlike
+    # pandas' to_csv it quotes the header and every string value.
+    sink = pa.BufferOutputStream()
+    pa_csv.write_csv(pa.Table.from_pandas(export, preserve_index=False), sink)
+    return sink.getvalue().to_pybytes()
 
 # =============================
 # Sidebar – Business Controls
@@ -91,7 +275,7 @@ show_percentage = st.sidebar.checkbox("Show Percentage")
 # -----------------------------
 # Geography Filters
 # -----------------------------
-states = sorted(long_data["State"].unique())
+states = data["State"].cat.categories.tolist()
 
 # ✅ Multiselect instead of selectbox, with Tamil Nadu as default
 selected_states = st.sidebar.multiselect(
@@ -101,10 +285,12 @@ selected_states = st.sidebar.multiselect(
 )
 
 if view_level == "District-wise":
-    districts = sorted(
-        long_data.loc[long_data["State"].isin(selected_states), "District"]
-        .dropna().unique()
-    )
+    # ⚡ Union of the selected states' districts is an OR over matrix rows
+    membership = state_district_membership(source_mtime)
+    district_mask = membership[
+        data["State"].cat.categories.get_indexer(selected_states)
+    ].any(axis=0)
+    districts = data["District"].cat.categories[district_mask].tolist()
     selected_districts = st.sidebar.multiselect(
         "Select District(s)",
         options=districts,
@@ -114,16 +300,18 @@ else:
     selected_districts = None
 
 # -----------------------------
-# Filter by Geography
+# Filter by Geography (wide form)
 # -----------------------------
-filtered_data = long_data[long_data["State"].isin(selected_states)]
+if not selected_states:
+    st.warning("Select at least one state.")
+    st.stop()
+
+geo_data = data[data["State"].isin(selected_states)]
 
 if selected_districts:
-    filtered_data = filtered_data[
-        filtered_data["District"].isin(selected_districts)
-    ]
+    geo_data = geo_data[geo_data["District"].isin(selected_districts)]
 
-if filtered_data.empty:
+if geo_data.empty:
     st.warning("No data available for the selected filters.")
     st.stop()
 
@@ -131,45 +319,86 @@ if filtered_data.empty:
 # Worker Filters
 # -----------------------------
 worker_type = st.sidebar.selectbox(
-    "Worker Type", sorted(filtered_data["Worker_Type"].unique())
+    "Worker Type", worker_type_options
 )
 area = st.sidebar.selectbox(
-    "Area", sorted(filtered_data["Area"].unique())
+    "Area", area_options
 )
 gender = st.sidebar.selectbox(
-    "Gender", sorted(filtered_data["Gender"].unique())
+    "Gender", gender_options
 )
 
-filtered_data = filtered_data[
-    (filtered_data["Worker_Type"] == worker_type) &
-    (filtered_data["Area"] == area) &
-    (filtered_data["Gender"] == gender)
-]
+# ⚡ Pick the single worker column instead of melting and re-filtering
+worker_col = worker_col_lookup[(worker_type, area, gender)]
+
+filtered_data = (
+    geo_data[id_cols + [worker_col]]
+    .rename(columns={worker_col: "Count"})
+    .dropna(subset=["Count"])
+)
 
 # -----------------------------
 # Industry Filter (district-aware)
 # -----------------------------
-industry_options = sorted(filtered_data["Industry_Category"].unique())
+# Categories are already sorted; mark the ones present via their int codes
+industry_cats = data["Industry_Category"].cat.categories
+industry_codes = filtered_data["Industry_Category"].cat.codes.to_numpy()
+industry_present = np.bincount(
+    industry_codes[industry_codes >= 0], minlength=len(industry_cats)
+) > 0
+industry_options = industry_cats[industry_present].tolist()
 selected_clusters = st.sidebar.multiselect(
     "Select Industry",
     industry_options,
     default=industry_options
 )
+# ⚡ Stop before any aggregation or figure is built for an empty selection
+if not selected_clusters:
+    st.warning("Select at least one industry.")
+    st.stop()
+
 filtered_data = filtered_data[
     filtered_data["Industry_Category"].isin(selected_clusters)
 ]
 
+if filtered_data.empty:
+    st.warning("No data available for the selected filters.")
+    st.stop()
+
+# ⚡ Primitive tuple identifying filtered_data; cached functions hash this
+# instead of pickling the DataFrame on every rerun. source_mtime keeps the
+# key in step with the data, as for the other caches.
+filter_key = (
+    tuple(selected_states),
+    tuple(selected_districts or ()),
+    worker_col,
+    tuple(selected_clusters),
+    source_mtime
+)
+
+geo_col = "District" if view_level == "District-wise" else "State"
+
+# ⚡ Cached on the filter selections; toggling "Show Percentage" only
+# rescales the small aggregated frames below
+kpis, industry_df, geo_df, pivot_df = workforce_summary(
+    filter_key, geo_col, filtered_data
+)
+
 # -----------------------------
-# Percentage Handling
+# Percentage Handling (on the aggregates, not the filtered rows)
 # -----------------------------
 if show_percentage:
-    total = filtered_data["Count"].sum()
-    filtered_data["Value"] = (filtered_data["Count"] / total) * 100
-    value_col = "Value"
+    # Percentages go to Plotly as 2-decimal float32 so the figure JSON
+    # does not carry full float64 digits
+    scale = 100 / kpis["total"] if kpis["total"] else 0
+    industry_df["Count"] = (industry_df["Count"] * scale).round(2).astype("float32")
+    geo_df["Count"] = (geo_df["Count"] * scale).round(2).astype("float32")
+    pivot_df = (pivot_df * scale).round(2).astype("float32")
     y_label = "Percentage (%)"
+    plot_dtype = "float32"
 else:
-    value_col = "Count"
     y_label = "Workers"
+    plot_dtype = "uint32"
 
 # =============================
 # KPI Section
@@ -177,68 +406,83 @@ else:
 st.subheader("📌 Key Workforce Indicators")
 
 col1, col2, col3, col4 = st.columns(4)
-col1.metric("Total Workers", f"{filtered_data['Count'].sum():,.0f}")
-col2.metric("Industries", filtered_data["Industry_Category"].nunique())
-col3.metric("States", filtered_data["State"].nunique())
-col4.metric("Districts", filtered_data["District"].nunique())
+col1.metric("Total Workers", f"{kpis['total']:,.0f}")
+col2.metric("Industries", kpis["industries"])
+col3.metric("States", kpis["states"])
+col4.metric("Districts", kpis["districts"])
 
 # =============================
 # Core Visualizations
 # =============================
 st.subheader("🏭 Industry-wise Workforce")
 
-industry_df = (
-    filtered_data.groupby("Industry_Category")[value_col]
-    .sum()
-    .reset_index()
-    .sort_values(value_col, ascending=False)
-)
-
-fig_industry = px.bar(
-    industry_df,
-    x="Industry_Category",
-    y=value_col,
-    text_auto=True,
-    labels={value_col: y_label},
-    title="Workforce by Industry"
+# ⚡ Inputs are already aggregated, so skip plotly-express' dataframe parsing
+fig_industry = go.Figure(go.Bar(
+    x=industry_df["Industry_Category"].to_numpy(),
+    y=industry_df["Count"].to_numpy(dtype=plot_dtype),
+    texttemplate="%{y}"
+))
+fig_industry.update_layout(
+    title="Workforce by Industry",
+    xaxis_title="Industry_Category",
+    yaxis_title=y_label
 )
 st.plotly_chart(fig_industry, use_container_width=True)
 
-geo_col = "District" if view_level == "District-wise" else "State"
-
-geo_df = (
-    filtered_data.groupby(geo_col)[value_col]
-    .sum()
-    .reset_index()
-    .sort_values(value_col, ascending=False)
-)
-
 st.subheader("🌍 Geography-wise Workforce")
 
-fig_geo = px.bar(
-    geo_df,
-    x=geo_col,
-    y=value_col,
-    text_auto=True,
-    labels={value_col: y_label},
-    title=f"Workforce by {geo_col}"
+fig_geo = go.Figure(go.Bar(
+    x=geo_df[geo_col].to_numpy(),
+    y=geo_df["Count"].to_numpy(dtype=plot_dtype),
+    texttemplate="%{y}"
+))
+fig_geo.update_layout(
+    title=f"Workforce by {geo_col}",
+    xaxis_title=geo_col,
+    yaxis_title=y_label
 )
 st.plotly_chart(fig_geo, use_container_width=True)
 
 st.subheader("🔥 Industry vs Geography Heatmap")
 
-pivot_df = filtered_data.pivot_table(
-    values=value_col,
-    index="Industry_Category",
-    columns=geo_col,
-    aggfunc="sum",
-    fill_value=0
-)
-
-fig_heatmap = px.imshow(
-    pivot_df,
-    labels=dict(x=geo_col, y="Industry", color=y_label),
-    title="Industry–Geography Workforce Intensity"
+HEATMAP_MAX_CELLS = 5000
+HEATMAP_TOP_ROWS = 30
+HEATMAP_TOP_COLS = 40
+
+# ⚡ Nationwide views produce thousands of cells; keep only the largest
+# industries / geographies so the browser does not draw them all
+if pivot_df.size > HEATMAP_MAX_CELLS:
+    row_totals = pivot_df.sum(axis=1)
+    col_totals = pivot_df.sum(axis=0)
+    truncated = []
+
+    if len(pivot_df.index) > HEATMAP_TOP_ROWS:
+        pivot_df = pivot_df.loc[row_totals.nlargest(HEATMAP_TOP_ROWS).index]
+        truncated.append(f"top {HEATMAP_TOP_ROWS} industries")
+
+    if len(pivot_df.columns) > HEATMAP_TOP_COLS:
+        pivot_df = pivot_df[col_totals.nlargest(HEATMAP_TOP_COLS).index]
+        truncated.append(f"top {HEATMAP_TOP_COLS} {geo_col.lower()}s")
+
+    if truncated:
+        st.caption(f"Showing the {' and '.join(truncated)} by workforce.")
+
+# ⚡ go.Heatmap from raw arrays (the WebGL heatmapgl trace is gone from
+# Plotly); zsmooth=False keeps it to one flat fill per cell. Arrow-backed
+# columns need an explicit dtype or to_numpy() returns an object array.
+fig_heatmap = go.Figure(go.Heatmap(
+    z=pivot_df.to_numpy(dtype=plot_dtype),
+    x=pivot_df.columns.tolist(),
+    y=pivot_df.index.tolist(),
+    zsmooth=False,
+    colorscale="Viridis",
+    colorbar=dict(title=y_label),
+    hovertemplate=f"{geo_col}: %{{x}}<br>Industry: %{{y}}<br>{y_label}: %{{z}}<extra></extra>"
+))
+fig_heatmap.update_layout(
+    title="Industry–Geography Workforce Intensity",
+    xaxis_title=geo_col,
+    yaxis_title="Industry"
 )
 
 # ✅ Enlarge cells by increasing figure size
@@ -248,7 +492,7 @@ fig_heatmap.update_layout(
     height=900,   # increase height
     margin=dict(l=100, r=100, t=100, b=200),
     xaxis=dict(tickangle=45, tickfont=dict(size=12)),
-    yaxis=dict(tickfont=dict(size=12))
+    yaxis=dict(tickfont=dict(size=12), autorange="reversed")
 )
 
 st.plotly_chart(fig_heatmap, use_container_width=False)
@@ -261,18 +505,20 @@ st.plotly_chart(fig_heatmap, use_container_width=False)
 if use_case == "Industrial Investment Planning":
     st.subheader("🏗️ Investment Opportunity Analysis")
 
-    invest_df = (
-        filtered_data.groupby("District")
-        .agg(
-            Total_Workers=("Count", "sum"),
-            Industry_Count=("Industry_Category", "nunique")
-        )
-        .reset_index()
-    )
+    # Row sums are the workforce, non-zero cells the industries present
+    sums, district_names, _ = district_industry_sums(filtered_data)
 
+    invest_df = pd.DataFrame({
+        "District": district_names,
+        "Total_Workers": sums.sum(axis=1),
+        "Industry_Count": (sums > 0).sum(axis=1)
+    })
+
+    # Districts with no workers have no industries present; score them 0
     invest_df["Investment_Score"] = (
-        invest_df["Total_Workers"] / invest_df["Industry_Count"]
-    )
+        invest_df["Total_Workers"]
+        / invest_df["Industry_Count"].where(invest_df["Industry_Count"] > 0)
+    ).fillna(0)
 
     st.dataframe(
         invest_df.sort_values("Investment_Score", ascending=False)
@@ -280,7 +526,8 @@ if use_case == "Industrial Investment Planning":
 
     st.info(
         "Districts with high workforce and low industry saturation "
-        "are ideal for new industrial investments."
+        "are ideal for new industrial investments. Industry_Count only "
+        "counts industries with at least one worker in the selected group."
     )
 
 # 2️⃣ Skill Gap Analysis
@@ -288,7 +535,7 @@ elif use_case == "Skill Gap Analysis":
     st.subheader("🎓 Skill Gap Analysis")
 
     skill_df = (
-        filtered_data.groupby(["District", "Industry_Category"])["Count"]
+        filtered_data.groupby(["District", "Industry_Category"], observed=True)["Count"]
         .sum()
         .reset_index()
     )
@@ -304,15 +551,7 @@ elif use_case == "Skill Gap Analysis":
 elif use_case == "Gender & Inclusion Analysis":
     st.subheader("👩‍👩‍👧 Gender Participation Analysis")
 
-    gender_df = (
-        long_data[
-            (long_data["State"].isin(selected_states)) &
-            (long_data["Worker_Type"] == worker_type)
-        ]
-        .groupby(["Industry_Category", "Gender"])["Count"]
-        .sum()
-        .reset_index()
-    )
+    gender_df = gender_composition(tuple(selected_states), worker_type, source_mtime)
 
     fig_gender = px.bar(
         gender_df,
@@ -328,16 +567,19 @@ elif use_case == "Gender & Inclusion Analysis":
 elif use_case == "Industry Dependency Risk":
     st.subheader("⚠️ Industry Dependency Risk")
 
-    dep_df = (
-        filtered_data.groupby(["District", "Industry_Category"])["Count"]
-        .sum()
-        .reset_index()
-    )
+    sums, district_names, industry_names = district_industry_sums(filtered_data)
+    totals = sums.sum(axis=1, keepdims=True)
 
-    dep_df["Share"] = dep_df.groupby("District")["Count"]\
-                            .transform(lambda x: x / x.sum())
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = sums / totals
 
-    risk_df = dep_df[dep_df["Share"] > 0.6]
+    d_idx, i_idx = np.nonzero(share > 0.6)
+    risk_df = pd.DataFrame({
+        "District": district_names[d_idx],
+        "Industry_Category": industry_names[i_idx],
+        "Count": sums[d_idx, i_idx],
+        "Share": share[d_idx, i_idx]
+    })
 
     st.dataframe(risk_df)
 
@@ -350,22 +592,15 @@ elif use_case == "Industry Dependency Risk":
 elif use_case == "Urbanization & Migration":
     st.subheader("🏙️ Urban vs Rural Workforce")
 
-    # ⚡ Use long_data filtered only by geography, NOT by Area
-    ur_data = long_data[
-        (long_data["State"].isin(selected_states)) &
-        (long_data["Industry_Category"].isin(selected_clusters)) &
-        (long_data["Worker_Type"] == worker_type) &
-        (long_data["Gender"] == gender)
-    ]
-
-    if selected_districts:
-        ur_data = ur_data[ur_data["District"].isin(selected_districts)]
+    # ⚡ geo_data is already filtered by geography and every Area has its
+    # own wide column, so the long form does not need to be re-scanned
+    ur_cols = [worker_col_lookup[(worker_type, a, gender)] for a in area_options]
+    ur_rows = geo_data["Industry_Category"].isin(selected_clusters)
 
-    ur_df = (
-        ur_data.groupby("Area")["Count"]
-        .sum()
-        .reset_index()
-    )
+    ur_df = pd.DataFrame({
+        "Area": area_options,
+        "Count": geo_data.loc[ur_rows, ur_cols].sum().to_numpy()
+    })
 
     fig_ur = px.pie(
         ur_df,
@@ -380,7 +615,7 @@ elif use_case == "Urbanization & Migration":
 # =============================
 st.download_button(
     "⬇️ Download Filtered Data",
-    filtered_data.to_csv(index=False),
+    filtered_csv(filter_key, filtered_data),
     "filtered_workforce_data.csv",
     mime="text/csv"
 )
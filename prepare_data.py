@@ -0,0 +1,39 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+
+# -----------------------------
+# Paths
+# -----------------------------
+DATA_DIR = Path(__file__).resolve().parent
+CSV_PATH = DATA_DIR / "Industry_cluster.csv"
+PARQUET_PATH = DATA_DIR / "Industry_cluster.parquet"
+
+
+# -----------------------------
+# One-time CSV → Parquet conversion
+# -----------------------------
+def convert():
+    # Arrow's multithreaded CSV reader, straight into Arrow-backed columns.
+    # Every column is kept: the dashboard reads the keys and worker counts,
+    # and the download also carries the NIC class and code columns.
+    data = pd.read_csv(CSV_PATH, engine="pyarrow", dtype_backend="pyarrow")
+
+    # The unnamed leading column is the source row number; use the name the
+    # default pandas reader gives it so the export header stays the same
+    data = data.rename(columns={"": "Unnamed: 0"})
+
+    worker_cols = [c for c in data.columns if c.startswith(("Main_Workers", "Marginal_Workers"))]
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+
+    # ZSTD for the repetitive identifier columns, Snappy for the counts
+    compression = {c: ("snappy" if c in worker_cols else "zstd") for c in table.column_names}
+
+    pq.write_table(table, PARQUET_PATH, compression=compression)
+
+
+if __name__ == "__main__":
+    convert()
+    print(f"Wrote {PARQUET_PATH}")